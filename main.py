@@ -1,11 +1,16 @@
 import multiprocessing
 multiprocessing.set_start_method("spawn", force=True)
 
-from nicegui import ui
+from nicegui import app, ui
 import numpy as np
 import sounddevice as sd
 import random
 import time
+import queue
+import asyncio
+import threading
+from collections import deque
+from functools import partial
 from datetime import datetime
 import argparse
 import sqlite3
@@ -34,211 +39,229 @@ class SessionHistory:
             db_path = home / '.morse_echo.db'
         
         self.db_path = str(db_path)
+        # One long-lived connection shared by all operations; NiceGUI may call in from
+        # different threads, so access is serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = self._connect()
         self._init_schema()
     
-    def _get_connection(self):
-        """Get a fresh database connection for each operation."""
-        conn = sqlite3.connect(self.db_path)
+    def _connect(self):
+        """Open the database connection and apply connection-level tuning."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row  # Enable column access by name
+        # Per-connection tuning; WAL journal mode is persistent and set once in _init_schema
+        conn.executescript('''
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=30000000;
+            PRAGMA cache_size=-20000;
+        ''')
         return conn
     
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
     def _init_schema(self):
         """Create tables if they don't exist."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Sessions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                duration INTEGER NOT NULL,
-                wpm INTEGER NOT NULL,
-                total_attempts INTEGER NOT NULL,
-                correct_attempts INTEGER NOT NULL,
-                accuracy REAL NOT NULL,
-                avg_response_time REAL
-            )
-        ''')
-        
-        # Individual attempts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS attempts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                char TEXT NOT NULL,
-                response_time REAL NOT NULL,
-                correct BOOLEAN NOT NULL,
-                pressed_char TEXT,
-                FOREIGN KEY(session_id) REFERENCES sessions(id)
-            )
-        ''')
-        
-        # Character statistics table (aggregated)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS character_stats (
-                char TEXT PRIMARY KEY,
-                total_attempts INTEGER NOT NULL DEFAULT 0,
-                correct_attempts INTEGER NOT NULL DEFAULT 0,
-                total_response_time REAL NOT NULL DEFAULT 0.0,
-                last_practiced TEXT
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            # Write-ahead logging: fewer fsyncs per save and readers aren't blocked by writers
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
+            # Sessions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    duration INTEGER NOT NULL,
+                    wpm INTEGER NOT NULL,
+                    total_attempts INTEGER NOT NULL,
+                    correct_attempts INTEGER NOT NULL,
+                    accuracy REAL NOT NULL,
+                    avg_response_time REAL
+                )
+            ''')
+            
+            # Individual attempts table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS attempts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id INTEGER NOT NULL,
+                    char TEXT NOT NULL,
+                    response_time REAL NOT NULL,
+                    correct BOOLEAN NOT NULL,
+                    pressed_char TEXT,
+                    FOREIGN KEY(session_id) REFERENCES sessions(id)
+                )
+            ''')
+            
+            # Character statistics table (aggregated)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS character_stats (
+                    char TEXT PRIMARY KEY,
+                    total_attempts INTEGER NOT NULL DEFAULT 0,
+                    correct_attempts INTEGER NOT NULL DEFAULT 0,
+                    total_response_time REAL NOT NULL DEFAULT 0.0,
+                    last_practiced TEXT
+                )
+            ''')
+            
+            # Indexes for the history queries (ORDER BY timestamp) and the export join
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_attempts_session ON attempts(session_id)')
     
     def save_session(self, scores, wpm, duration):
         """Save a completed session to the database."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Calculate session statistics
+        # Calculate session statistics in a single pass
         total_attempts = len(scores)
-        correct_attempts = sum(1 for (_, _, correct, _) in scores if correct)
-        accuracy = (correct_attempts / total_attempts * 100) if total_attempts > 0 else 0.0
+        correct_attempts = 0
+        correct_time = 0.0
+        for _, response_time, correct, _ in scores:
+            if correct:
+                correct_attempts += 1
+                correct_time += response_time
         
-        correct_times = [t for (_, t, correct, _) in scores if correct]
-        avg_response_time = (sum(correct_times) / len(correct_times)) if correct_times else None
+        accuracy = (correct_attempts / total_attempts * 100) if total_attempts > 0 else 0.0
+        avg_response_time = (correct_time / correct_attempts) if correct_attempts else None
         
         timestamp = datetime.now().isoformat()
         
-        # Insert session record
-        cursor.execute('''
-            INSERT INTO sessions (timestamp, duration, wpm, total_attempts, correct_attempts, accuracy, avg_response_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (timestamp, duration, wpm, total_attempts, correct_attempts, accuracy, avg_response_time))
-        
-        session_id = cursor.lastrowid
-        
-        # Insert individual attempts
-        for char, response_time, correct, pressed_char in scores:
+        # The connection context manager commits on success and rolls back on error
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            # Take the write lock up front so the whole save is a single transaction
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            # Insert session record
             cursor.execute('''
+                INSERT INTO sessions (timestamp, duration, wpm, total_attempts, correct_attempts, accuracy, avg_response_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (timestamp, duration, wpm, total_attempts, correct_attempts, accuracy, avg_response_time))
+            
+            session_id = cursor.lastrowid
+            
+            # Insert individual attempts in one batch
+            cursor.executemany('''
                 INSERT INTO attempts (session_id, char, response_time, correct, pressed_char)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (session_id, char, response_time, correct, pressed_char))
+            ''', [(session_id, char, response_time, correct, pressed_char)
+                  for char, response_time, correct, pressed_char in scores])
             
-            # Update character statistics
+            # Update character statistics, aggregated in SQL from the attempts just inserted
             cursor.execute('''
                 INSERT INTO character_stats (char, total_attempts, correct_attempts, total_response_time, last_practiced)
-                VALUES (?, 1, ?, ?, ?)
+                SELECT char, COUNT(*), SUM(correct), SUM(response_time), ?
+                FROM attempts
+                WHERE session_id = ?
+                GROUP BY char
                 ON CONFLICT(char) DO UPDATE SET
-                    total_attempts = total_attempts + 1,
-                    correct_attempts = correct_attempts + ?,
-                    total_response_time = total_response_time + ?,
-                    last_practiced = ?
-            ''', (char, 1 if correct else 0, response_time, timestamp,
-                  1 if correct else 0, response_time, timestamp))
-        
-        conn.commit()
-        conn.close()
+                    total_attempts = total_attempts + excluded.total_attempts,
+                    correct_attempts = correct_attempts + excluded.correct_attempts,
+                    total_response_time = total_response_time + excluded.total_response_time,
+                    last_practiced = excluded.last_practiced
+            ''', (timestamp, session_id))
         return session_id
     
     def get_recent_sessions(self, limit=20):
-        """Get the most recent sessions."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM sessions
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (limit,))
-        result = cursor.fetchall()
-        conn.close()
+        """Get the most recent sessions, with display-ready date and time columns."""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute('''
+                SELECT
+                    *,
+                    strftime('%Y-%m-%d', timestamp) AS date,
+                    strftime('%H:%M', timestamp) AS time
+                FROM sessions
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ''', (limit,))
+            result = cursor.fetchall()
         return result
     
     def get_character_stats(self):
         """Get aggregated statistics for each character."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT 
-                char,
-                total_attempts,
-                correct_attempts,
-                CAST(correct_attempts AS REAL) / total_attempts * 100 as accuracy,
-                total_response_time / NULLIF(correct_attempts, 0) as avg_response_time,
-                last_practiced
-            FROM character_stats
-            WHERE total_attempts > 0
-            ORDER BY char
-        ''')
-        result = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    char,
+                    total_attempts,
+                    correct_attempts,
+                    CAST(correct_attempts AS REAL) / total_attempts * 100 as accuracy,
+                    total_response_time / NULLIF(correct_attempts, 0) as avg_response_time,
+                    last_practiced
+                FROM character_stats
+                WHERE total_attempts > 0
+                ORDER BY char
+            ''')
+            result = cursor.fetchall()
         return result
     
     def get_progress_data(self, days=30):
         """Get session data for progress charts."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
         cutoff = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         from datetime import timedelta
         cutoff = (cutoff - timedelta(days=days)).isoformat()
         
-        cursor.execute('''
-            SELECT timestamp, accuracy, avg_response_time, wpm, total_attempts
-            FROM sessions
-            WHERE timestamp >= ?
-            ORDER BY timestamp ASC
-        ''', (cutoff,))
-        result = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute('''
+                SELECT timestamp, accuracy, avg_response_time, wpm, total_attempts
+                FROM sessions
+                WHERE timestamp >= ?
+                ORDER BY timestamp ASC
+            ''', (cutoff,))
+            result = cursor.fetchall()
         return result
     
     def clear_all_data(self):
         """Delete all session data from the database."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM attempts')
-        cursor.execute('DELETE FROM sessions')
-        cursor.execute('DELETE FROM character_stats')
-        
-        conn.commit()
-        conn.close()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            cursor.execute('DELETE FROM attempts')
+            cursor.execute('DELETE FROM sessions')
+            cursor.execute('DELETE FROM character_stats')
     
     def export_to_csv(self, filename):
         """Export all session data to CSV file."""
         import csv
         
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Get all attempts with session info
-        cursor.execute('''
-            SELECT 
-                s.timestamp,
-                s.wpm,
-                a.char,
-                a.response_time,
-                a.correct,
-                a.pressed_char
-            FROM attempts a
-            JOIN sessions s ON a.session_id = s.id
-            ORDER BY s.timestamp, a.id
-        ''')
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        # Write to CSV
-        with open(filename, 'w', newline='') as f:
+        # Stream rows from the cursor straight into the CSV writer instead of fetching them all
+        with open(filename, 'w', newline='') as f, self._lock:
             writer = csv.writer(f)
             writer.writerow(['Timestamp', 'WPM', 'Character', 'ResponseTime', 'Correct', 'PressedChar'])
-            for row in rows:
-                writer.writerow([
-                    row['timestamp'],
-                    row['wpm'],
-                    row['char'],
-                    row['response_time'],
-                    'Yes' if row['correct'] else 'No',
-                    row['pressed_char'] if row['pressed_char'] else ''
-                ])
+            
+            cursor = self._conn.cursor()
+            cursor.arraysize = 1000
+            # Get all attempts with session info
+            cursor.execute('''
+                SELECT 
+                    s.timestamp,
+                    s.wpm,
+                    a.char,
+                    a.response_time,
+                    a.correct,
+                    a.pressed_char
+                FROM attempts a
+                JOIN sessions s ON a.session_id = s.id
+                ORDER BY s.timestamp, a.id
+            ''')
+            
+            correct_labels = ('No', 'Yes')
+            writer.writerows(
+                (row['timestamp'], row['wpm'], row['char'], row['response_time'],
+                 correct_labels[bool(row['correct'])], row['pressed_char'] or '')
+                for row in cursor
+            )
 
 class MorseGame:
     def __init__(self, debug=False):
-        # Debug mode
+        # Debug mode; with debug off, log is a no-op so calls skip the timestamp work
         self.debug = debug
+        if not debug:
+            self.log = lambda message: None
         
         # Initialize session history
         self.history = SessionHistory()
@@ -254,6 +277,21 @@ class MorseGame:
         sd.default.latency = 'low'
         sd.default.blocksize = 2048  # Larger blocksize for stability
         sd.default.dtype = 'float32'
+        self._stream = None  # Persistent output stream, open only during a session
+        # Audio runs on a worker thread; the UI thread only enqueues stream commands and buffers.
+        # Only one prompt is in flight at a time (see _prompt_playing); control commands never wait
+        self._audio_q = queue.Queue()
+        self._loop = None  # UI event loop, used by the worker to report finished prompts
+        self._prompt_playing = False  # a character is queued or still being written
+        self._next_pending = False  # next_char is due once the playing character finishes
+        threading.Thread(target=self._audio_worker, daemon=True).start()
+
+        # Precomputed waveforms for the current WPM, and the fixed end-of-session bell
+        self._wave_cache = {}  # wpm -> {char: waveform}
+        # 5ms attack ramp shared by every tone (only depends on the sample rate)
+        self._envelope_ramp = np.linspace(0, 1, int(self.sample_rate * 0.005), dtype=np.float32)
+        self._build_tone_cache()
+        self._bell = self.generate_bell()
 
         # Session state
         self.session_active = False
@@ -263,30 +301,37 @@ class MorseGame:
 
         # Game state
         self.current_char = None
-        self.play_time = None
+        self.play_time = None  # time.perf_counter() value when the current prompt started
         self.scores = []  # (played_char, time, correct, pressed_char)
+        self._correct_sum = 0.0  # running total of correct response times
+        self._correct_count = 0
         self.best_score = float('inf')
-        self._is_playing = False
         self.include_numbers = False  # Whether to include numbers in training
+        self._all_chars = tuple(MORSE_CODE.keys())
+        self._letters = tuple(c for c in self._all_chars if c.isalpha())  # Only letters (A-Z)
+        self._rng = random.Random()  # Dedicated generator for character selection
 
         # UI elements
         self.score_list = None
+        self._score_placeholder = None
         self.status_label = None
         self.summary_label = None
         self.start_button = None
         self.stop_button = None
         self.length_input = None
         self.wpm_slider = None
-        self.response_times = []  # list of response times for correct answers
+        self.response_times = deque(maxlen=40)  # last 40 response times for correct answers (chart window)
+        self._response_count = 0  # total correct responses recorded, used to detect new chart data
         self.score_display = None
+        self._chart_cache_key = None  # _response_count at the last chart render
+        self._history_loaded = False  # History tab data is loaded on first view
 
         self.create_ui()
     
     def log(self, message):
-        """Print debug message if debug mode is enabled."""
-        if self.debug:
-            timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
-            print(f"[{timestamp}] {message}")
+        """Print a timestamped debug message (replaced by a no-op unless debug is enabled)."""
+        timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
+        print(f"[{timestamp}] {message}")
     
     def _calculate_dot_duration(self, wpm):
         """Calculate dot duration from WPM. Standard word = 50 dot durations (PARIS method)."""
@@ -297,6 +342,7 @@ class MorseGame:
         self.wpm = new_wpm
         self.dot_duration = self._calculate_dot_duration(new_wpm)
         self.dash_duration = self.dot_duration * 3
+        self._build_tone_cache()
         self.log(f"update_wpm: WPM set to {new_wpm}, dot_duration={self.dot_duration:.3f}s")
     
     def create_ui(self):
@@ -309,6 +355,8 @@ class MorseGame:
             with ui.tabs().classes('w-full') as tabs:
                 practice_tab = ui.tab('Practice')
                 history_tab = ui.tab('History')
+            self._history_tab = history_tab
+            tabs.on_value_change(self._on_tab_change)
             
             with ui.tab_panels(tabs, value=practice_tab).classes('w-full'):
                 # Practice Tab
@@ -349,7 +397,7 @@ class MorseGame:
             with ui.column().classes('flex-none').style('width: 400px'):
                 with ui.card().classes('w-full p-3 h-full'):
                     ui.label('Current Session').classes('text-lg font-bold mb-1')
-                    self.score_list = ui.html('', sanitize=False).classes('overflow-y-auto font-mono pr-2').style('height: 600px')
+                    self.score_list = ui.column().classes('overflow-y-auto font-mono pr-2 gap-0 flex-nowrap').style('height: 600px')
     
     def create_history_ui(self):
         """Create the history and analytics UI."""
@@ -381,21 +429,24 @@ class MorseGame:
             with ui.card().classes('w-full max-w-4xl p-4'):
                 ui.label('Character Statistics').classes('text-xl font-bold mb-2')
                 self.char_stats_grid = ui.html('', sanitize=False).classes('w-full')
-            
-            # Load initial data
+    
+    def _on_tab_change(self, e):
+        """Load history data the first time the History tab is opened."""
+        # The value is the tab name when changed from the browser, the tab element when set in code
+        if e.value in ('History', self._history_tab) and not self._history_loaded:
             self.refresh_history()
     
     def refresh_history(self):
         """Refresh history data from database."""
+        self._history_loaded = True
         # Get recent sessions
         sessions = self.history.get_recent_sessions(20)
         rows = []
         for session in sessions:
-            dt = datetime.fromisoformat(session['timestamp'])
             rows.append({
                 'id': session['id'],
-                'date': dt.strftime('%Y-%m-%d'),
-                'time': dt.strftime('%H:%M'),
+                'date': session['date'],
+                'time': session['time'],
                 'wpm': session['wpm'],
                 'attempts': session['total_attempts'],
                 'correct': session['correct_attempts'],
@@ -409,7 +460,7 @@ class MorseGame:
         char_stats = self.history.get_character_stats()
         
         # Create a grid display for character stats
-        char_html = '<div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(80px, 1fr)); gap: 8px;">'
+        parts = ['<div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(80px, 1fr)); gap: 8px;">']
         for stat in char_stats:
             char = stat['char']
             accuracy = stat['accuracy']
@@ -427,17 +478,17 @@ class MorseGame:
             # Handle null avg_time
             avg_time_str = f"{avg_time:.2f}s" if avg_time is not None else "N/A"
             
-            char_html += f'''
+            parts.append(f'''
                 <div style="border: 2px solid {color}; border-radius: 8px; padding: 8px; text-align: center;">
                     <div style="font-size: 24px; font-weight: bold;">{char}</div>
                     <div style="font-size: 12px; color: #666;">{accuracy:.0f}%</div>
                     <div style="font-size: 11px; color: #888;">{avg_time_str}</div>
                     <div style="font-size: 10px; color: #999;">n={attempts}</div>
                 </div>
-            '''
+            ''')
         
-        char_html += '</div>'
-        self.char_stats_grid.content = char_html
+        parts.append('</div>')
+        self.char_stats_grid.content = ''.join(parts)
     
     def export_csv(self):
         """Export session history to CSV file."""
@@ -476,171 +527,288 @@ class MorseGame:
             self.log(f"clear_history: Failed - {e}")
     
     def update_ui(self):
-        # Update score history (show more items now that we have taller display)
-        def render_row(item):
-            played_char, t, correct, pressed = item
-            if correct:
-                return f'<span style="color: green">{"{:.2f}s".format(t)} - {played_char}</span>'
-            else:
-                return f'<span style="color: red">ERROR - played: {played_char}, pressed: {pressed}</span>'
-
-        scores_html = '<br>'.join(
-            render_row(item) for item in reversed(self.scores)
-        )
-        self.score_list.content = f'<div style="white-space: pre-wrap">{scores_html if scores_html else "No results yet"}</div>'
+        # Score rows are added incrementally by _add_score, so only status and chart update here
+        self._update_status()
+        self._update_chart()
+    
+    def _update_status(self):
+        """Reset the status line once no session is running."""
         if not self.session_active:
             self.status_label.text = 'Press Start to begin'
             self.status_label.classes('text-gray-600')
-
-        # Update response time chart (simple SVG sparkline)
+    
+    def _update_chart(self):
+        """Redraw the response time sparkline, skipped if no new data arrived."""
+        if self._response_count == self._chart_cache_key:
+            return
+        self._chart_cache_key = self._response_count
         if self.response_times:
             width = 360
             height = 120
             padding = 8
-            vals = self.response_times[-40:]  # Show last 40 responses
-            max_v = max(vals) if vals else 1.0
-            min_v = min(vals) if vals else 0.0
+            vals = np.fromiter(self.response_times, dtype=np.float64, count=len(self.response_times))
+            n = vals.size
+            max_v = vals.max()
+            min_v = vals.min()
             span = max_v - min_v if max_v > min_v else 1.0
-            pts = []
-            for i, v in enumerate(vals):
-                x = padding + i * (width - 2 * padding) / max(1, len(vals) - 1) if len(vals) > 1 else padding + (width - 2 * padding) / 2
-                y = padding + (height - 2 * padding) * (1 - (v - min_v) / span) if span > 0 else padding + (height - 2 * padding) / 2
-                pts.append(f"{x:.1f},{y:.1f}")
-            poly = ' '.join(pts)
-            svg = f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">'
-            svg += f'<rect x="0" y="0" width="{width}" height="{height}" fill="#fff" stroke="#eee"/>'
-            svg += f'<polyline fill="none" stroke="#2b8bdb" stroke-width="2" points="{poly}" />'
+            # Compute all point coordinates at once
+            if n > 1:
+                xs = padding + np.arange(n) * (width - 2 * padding) / (n - 1)
+            else:
+                xs = np.full(n, padding + (width - 2 * padding) / 2)
+            ys = padding + (height - 2 * padding) * (1 - (vals - min_v) / span)
+            poly = ' '.join(f"{x:.1f},{y:.1f}" for x, y in zip(xs.tolist(), ys.tolist()))
             # draw last value
-            last = vals[-1]
-            last_x = padding + (len(vals) - 1) * (width - 2 * padding) / max(1, len(vals) - 1) if len(vals) > 1 else padding + (width - 2 * padding) / 2
-            last_y = padding + (height - 2 * padding) * (1 - (last - min_v) / span) if span > 0 else padding + (height - 2 * padding) / 2
-            svg += f'<circle cx="{last_x:.1f}" cy="{last_y:.1f}" r="3" fill="#2b8bdb" />'
-            svg += '</svg>'
-            self.chart.content = svg
+            last_x = xs[-1]
+            last_y = ys[-1]
+            self.chart.content = ''.join([
+                f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">',
+                f'<rect x="0" y="0" width="{width}" height="{height}" fill="#fff" stroke="#eee"/>',
+                f'<polyline fill="none" stroke="#2b8bdb" stroke-width="2" points="{poly}" />',
+                f'<circle cx="{last_x:.1f}" cy="{last_y:.1f}" r="3" fill="#2b8bdb" />',
+                '</svg>',
+            ])
         else:
             self.chart.content = '<div style="color: #666; padding: 20px">No data yet</div>'
     
+    def _reset_score_list(self):
+        """Empty the session results list and show the placeholder."""
+        self.score_list.clear()
+        with self.score_list:
+            self._score_placeholder = ui.label('No results yet')
+    
+    def _add_score(self, item):
+        """Record a score and add its row to the top of the results list."""
+        self.scores.append(item)
+        played_char, t, correct, pressed = item
+        if self._score_placeholder is not None:
+            self.score_list.remove(self._score_placeholder)
+            self._score_placeholder = None
+        with self.score_list:
+            if correct:
+                row = ui.label(f'{t:.2f}s - {played_char}').style('color: green')
+            else:
+                row = ui.label(f'ERROR - played: {played_char}, pressed: {pressed}').style('color: red')
+        row.move(target_index=0)  # Newest first
+        if correct:
+            self._correct_sum += t
+            self._correct_count += 1
+    
     def generate_tone(self, duration):
         """Generate a tone with smooth attack/release envelope to reduce clicks."""
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
-        tone = np.sin(2 * np.pi * self.frequency * t)
+        # Build phase, sine and envelope in place in a single float32 buffer
+        tone = np.arange(samples, dtype=np.float32)
+        tone *= np.float32(2 * np.pi * self.frequency / self.sample_rate)
+        np.sin(tone, out=tone)
         
         # Apply gentle envelope to prevent clicks at start/end
-        envelope_samples = int(self.sample_rate * 0.005)  # 5ms attack/release
-        envelope = np.ones(samples)
+        ramp = self._envelope_ramp
+        envelope_samples = len(ramp)
         
-        # Attack
+        # Attack, and the same ramp reversed for the release
         if samples > envelope_samples:
-            envelope[:envelope_samples] = np.linspace(0, 1, envelope_samples)
-            # Release
-            envelope[-envelope_samples:] = np.linspace(1, 0, envelope_samples)
+            tone[:envelope_samples] *= ramp
+            tone[-envelope_samples:] *= ramp[::-1]
         
-        return (tone * envelope * 0.3).astype(np.float32)  # Reduce volume and ensure float32
+        tone *= np.float32(0.3)  # Reduce volume
+        return tone
     
-    def play_morse(self, morse_sequence):
-        """Generate and play morse code sequence with proper timing."""
-        signals = []
-        gap = np.zeros(int(self.dot_duration * self.sample_rate * 0.5), dtype=np.float32)
-        
-        for symbol in morse_sequence:
-            if symbol == '.':
-                signals.append(self.generate_tone(self.dot_duration))
-            elif symbol == '-':
-                signals.append(self.generate_tone(self.dash_duration))
-            signals.append(gap)
-        
-        # Concatenate all signals and ensure they're contiguous in memory
-        signal = np.concatenate(signals).astype(np.float32)
-        
-        # Add small padding at the end to prevent cutoff
-        padding = np.zeros(int(self.sample_rate * 0.05), dtype=np.float32)
-        signal = np.concatenate([signal, padding])
-        
-        # Play with blocking to ensure complete playback
-        sd.play(signal, self.sample_rate, blocking=True)
-        sd.wait()  # Ensure playback is fully completed
+    def _build_tone_cache(self):
+        """Precompute dot/dash tones, inter-symbol gap and end padding for the current WPM."""
+        # Character waveforms are kept per WPM, so returning to a speed used before is a lookup
+        cached = self._wave_cache.get(self.wpm)
+        if cached is None:
+            dot_tone = self.generate_tone(self.dot_duration)
+            dash_tone = self.generate_tone(self.dash_duration)
+            gap_samples = int(self.dot_duration * self.sample_rate * 0.5)
+            # Small padding at the end to prevent cutoff
+            end_pad_samples = int(self.sample_rate * 0.05)
+            cached = self._build_char_waves(dot_tone, dash_tone, gap_samples, end_pad_samples)
+            self._wave_cache[self.wpm] = cached
+        self._char_wave = cached
+    
+    def _build_char_waves(self, dot_tone, dash_tone, gap_samples, end_pad_samples):
+        """Assemble each character's tones, gaps and end padding into one preallocated buffer."""
+        char_wave = {}
+        for char, sequence in MORSE_CODE.items():
+            tones = [dot_tone if symbol == '.' else dash_tone for symbol in sequence]
+            total = sum(len(tone) for tone in tones) + gap_samples * len(tones) + end_pad_samples
+            # Zero-filled buffer, so the gaps and end padding are already in place
+            wave = np.zeros(total, dtype=np.float32)
+            pos = 0
+            for tone in tones:
+                wave[pos:pos + len(tone)] = tone
+                pos += len(tone) + gap_samples
+            char_wave[char] = wave
+        return char_wave
+    
+    def play_char(self, char):
+        """Queue the precomputed morse waveform for a character."""
+        self._loop = asyncio.get_running_loop()
+        self._prompt_playing = True
+        self._audio_q.put(partial(self._play_prompt, self._char_wave[char]))
+    
+    def _play_prompt(self, signal):
+        """Write a character on the audio worker, timing the prompt from when playback starts."""
+        try:
+            self.play_time = time.perf_counter()
+            self._write_audio(signal)
+        finally:
+            self._loop.call_soon_threadsafe(self._on_prompt_finished)
+    
+    def _on_prompt_finished(self):
+        """Runs on the UI loop once a character has been written; starts any pending next prompt."""
+        self._prompt_playing = False
+        if self._next_pending:
+            self._next_pending = False
+            if self.session_active:
+                self._loop.call_later(0.5, self.next_char)
+    
+    def _schedule_next_char(self):
+        """Play the next character 0.5s after the current one has finished sounding."""
+        if self._prompt_playing:
+            self._next_pending = True
+        else:
+            ui.timer(0.5, self.next_char, once=True)
+    
+    def _audio_worker(self):
+        """Run queued audio commands in order, off the UI event loop."""
+        while True:
+            command = self._audio_q.get()
+            try:
+                command()
+            except Exception as e:
+                self.log(f"_audio_worker: Audio command failed: {e}")
+            finally:
+                self._audio_q.task_done()
+    
+    def _enqueue_audio(self, signal):
+        """Queue a signal for playback on the audio worker and return immediately."""
+        self._audio_q.put(partial(self._write_audio, signal))
+    
+    def _open_stream(self):
+        """Open a persistent output stream so each character is just a write."""
+        if self._stream is not None:
+            return
+        try:
+            self._stream = sd.OutputStream(samplerate=self.sample_rate, channels=1, dtype='float32',
+                                           blocksize=2048, latency='low')
+            self._stream.start()
+            self.log("_open_stream: Output stream started")
+        except Exception as e:
+            self._stream = None
+            self.log(f"_open_stream: Failed to open output stream: {e}")
+    
+    def _close_stream(self):
+        """Stop and close the persistent output stream."""
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
+        except Exception as e:
+            self.log(f"_close_stream: Failed to close output stream: {e}")
+        self._stream = None
+    
+    def _write_audio(self, signal):
+        """Play a mono float32 signal, blocking until it has been handed to the device."""
+        if self._stream is not None:
+            self._stream.write(signal.reshape(-1, 1))
+        else:
+            # No session stream open, fall back to one-shot playback
+            sd.play(signal, self.sample_rate, blocking=True)
 
-    def play_bell(self, duration: float = 0.35, frequency: int = 1000):
-        """Play a short bell sound (decaying sine) to mark session end."""
+    def generate_bell(self, duration: float = 0.35, frequency: int = 1000):
+        """Generate a short bell sound (decaying sine) to mark session end."""
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
+        t = np.linspace(0, duration, samples, endpoint=False, dtype=np.float32)
         # exponential decay envelope
-        envelope = np.exp(-6 * t)
-        tone = (np.sin(2 * np.pi * frequency * t) * envelope * 0.45).astype(np.float32)
-        sd.play(tone, self.sample_rate, blocking=True)
-        sd.wait()  # Ensure playback completes
-    
-    def play_morse_and_reset_timer(self, morse_sequence):
-        if self._is_playing:
-            self.log("play_morse_and_reset_timer: Already playing, skipping")
-            return
-        self._is_playing = True
-        self.play_time = datetime.now()
-        self.log(f"play_morse_and_reset_timer: Playing morse for '{self.current_char}', play_time={self.play_time}")
-        self.play_morse(morse_sequence)
-        self._is_playing = False
+        envelope = np.exp(-6 * t, dtype=np.float32)
+        return np.sin(2 * np.pi * frequency * t, dtype=np.float32) * envelope * np.float32(0.45)
+    
+    def play_bell(self):
+        """Queue the precomputed end-of-session bell."""
+        self._enqueue_audio(self._bell)
+    
+    def play_morse_and_reset_timer(self, char):
+        # play_time is stamped by the audio worker when the character actually starts playing
+        self.play_time = None
+        if self.debug:
+            self.log(f"play_morse_and_reset_timer: Queueing morse for '{char}'")
+        self.play_char(char)
 
     
     
     
     def next_char(self):
+        if not self.session_active:
+            return
+        if self._prompt_playing:
+            # Never stack a prompt behind one still sounding; retry once it has finished
+            self._next_pending = True
+            return
         # Get available characters based on settings
-        if self.include_numbers:
-            available_chars = list(MORSE_CODE.keys())
-        else:
-            # Only letters (A-Z)
-            available_chars = [c for c in MORSE_CODE.keys() if c.isalpha()]
-        
-        self.current_char = random.choice(available_chars)
-        self.log(f"next_char: Selected '{self.current_char}'")
-        morse = MORSE_CODE[self.current_char]
-        self.play_morse_and_reset_timer(morse)
+        available_chars = self._all_chars if self.include_numbers else self._letters
+        self.current_char = available_chars[self._rng.randrange(len(available_chars))]
+        if self.debug:
+            self.log(f"next_char: Selected '{self.current_char}'")
+        self.play_morse_and_reset_timer(self.current_char)
         self.status_label.text = 'Listening...'
         self.status_label.classes('text-blue-600')
-        self.update_ui()
     
     def handle_keypress(self, e):
+        # Most key events are modifiers/navigation keys, so reject those before anything else
+        key_str = str(e.key)
+        if len(key_str) != 1:
+            return
         if not self.session_active or self.current_char is None or self.play_time is None:
-            self.log(f"handle_keypress: Ignoring key '{e.key}' (session_active={self.session_active}, current_char={self.current_char}, play_time={self.play_time})")
+            if self.debug:
+                self.log(f"handle_keypress: Ignoring key '{key_str}' (session_active={self.session_active}, current_char={self.current_char}, play_time={self.play_time})")
             return
-        if len(str(e.key)) == 1:
-            pressed_char = str(e.key).upper()
-            reaction_time = (datetime.now() - self.play_time).total_seconds()
+        pressed_char = key_str.upper()
+        reaction_time = time.perf_counter() - self.play_time
+        if self.debug:
             self.log(f"handle_keypress: Key '{pressed_char}' pressed, expected '{self.current_char}', reaction_time={reaction_time:.3f}s")
-            if pressed_char == self.current_char:
-                self.scores.append((self.current_char, reaction_time, True, pressed_char))
-                self.best_score = min(self.best_score, reaction_time)
-                # Add response time to chart data
-                self.response_times.append(reaction_time)
-                self.status_label.text = f'Correct! ({self.current_char})'
-                self.status_label.classes('text-green-600')
-                self.log(f"handle_keypress: CORRECT answer")
-            else:
-                self.scores.append((self.current_char, reaction_time, False, pressed_char))
-                self.status_label.text = f'Incorrect: you pressed {pressed_char}, expected {self.current_char}'
-                self.status_label.classes('text-red-600')
-                self.log(f"handle_keypress: INCORRECT answer")
-            # clear current prompt
-            self.log(f"handle_keypress: Clearing current_char and play_time")
-            self.current_char = None
-            self.play_time = None
-            self.update_ui()
-            # Move to next character if session is still active
-            if self.session_active:
-                self.log("handle_keypress: Scheduling next character in 0.5s")
-                ui.timer(0.5, self.next_char, once=True)
+        if pressed_char == self.current_char:
+            self._add_score((self.current_char, reaction_time, True, pressed_char))
+            self.best_score = min(self.best_score, reaction_time)
+            # Add response time to chart data
+            self.response_times.append(reaction_time)
+            self._response_count += 1
+            self.status_label.text = f'Correct! ({self.current_char})'
+            self.status_label.classes('text-green-600')
+            self.log("handle_keypress: CORRECT answer")
+        else:
+            self._add_score((self.current_char, reaction_time, False, pressed_char))
+            self.status_label.text = f'Incorrect: you pressed {pressed_char}, expected {self.current_char}'
+            self.status_label.classes('text-red-600')
+            self.log("handle_keypress: INCORRECT answer")
+        # clear current prompt
+        self.log("handle_keypress: Clearing current_char and play_time")
+        self.current_char = None
+        self.play_time = None
+        self._update_chart()  # session is active, so only the chart can have changed
+        # Move to next character if session is still active
+        if self.session_active:
+            self.log("handle_keypress: Scheduling next character 0.5s after playback")
+            self._schedule_next_char()
     def start_session(self):
         if self.session_active:
             return
         self.session_length = int(self.length_input.value)
         self.session_active = True
         self.scores.clear()
+        self._reset_score_list()
+        self._correct_sum = 0.0
+        self._correct_count = 0
         self.session_start_time = time.time()
         self.log(f"start_session: Starting session for {self.session_length}s")
         self.status_label.text = 'Session started!'
         self.status_label.classes('text-blue-600')
         self.score_display.text = ''  # Clear score at start
+        self._next_pending = False
+        self._audio_q.put(self._open_stream)
         self.update_ui()
         # buffer 1 second before first character
         ui.timer(1.0, self.next_char, once=True)
@@ -663,12 +831,11 @@ class MorseGame:
             self._session_timer = None
         # Calculate and display final score
         if self.scores:
-            correct = sum(1 for (_, _, c, _) in self.scores if c)
+            correct = self._correct_count
             total = len(self.scores)
             percentage = (correct / total * 100) if total > 0 else 0
             # also compute average response time for correct answers
-            correct_times = [t for (_, t, c, _) in self.scores if c]
-            avg = (sum(correct_times) / len(correct_times)) if correct_times else None
+            avg = (self._correct_sum / correct) if correct else None
             avg_text = f"{avg:.2f}s" if avg is not None else "N/A"
             self.score_display.text = f'Final Score: {correct}/{total} ({percentage:.1f}%), Avg: {avg_text}'
             
@@ -676,17 +843,15 @@ class MorseGame:
             try:
                 self.history.save_session(self.scores, self.wpm, self.session_length)
                 self.log(f"stop_session: Saved session with {total} attempts")
-                # Refresh history display to show new session
-                self.refresh_history()
+                # Refresh history display to show new session (otherwise loaded on first view)
+                if self._history_loaded:
+                    self.refresh_history()
             except Exception as e:
                 self.log(f"stop_session: Failed to save session: {e}")
         
-        # Play a bell to indicate session end
-        try:
-            self.play_bell()
-        except Exception:
-            # if audio fails, just continue
-            pass
+        # Play a bell to indicate session end (audio errors are logged by the worker)
+        self.play_bell()
+        self._audio_q.put(self._close_stream)  # after the bell has been written
         self.update_ui()
 
 
@@ -699,6 +864,7 @@ args = parser.parse_args()
 # Create game instance and set up keyboard handler
 game = MorseGame(debug=args.debug)
 ui.keyboard(on_key=game.handle_keypress)
+app.on_shutdown(game.history.close)
 
 # Start the app
 if args.native: